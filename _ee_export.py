@@ -0,0 +1,222 @@
+"""_ee_export.py – helpers shared by the ``export_*.py`` scripts.
+
+``parse_export_args`` is their common command line and ``export_image``
+their common body: it queues a Drive export of an image over the globe
+(``--wait`` polls it with ``wait_for_task`` until it finishes), or with
+``--local`` calls ``download_tiles``. That splits the region into tiles small
+enough for ``ee.Image.getDownloadURL``, fetches them concurrently and
+stitches them into a single GDAL virtual raster (``.vrt``).
+
+Dependencies: ``earthengine-api`` and ``requests``; building the VRT needs
+the GDAL command-line tools (``gdalbuildvrt``) on ``PATH``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import shutil
+import subprocess
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # annotations only; imported lazily at runtime
+    import ee
+    import requests
+
+# getDownloadURL rejects requests larger than 32 MB
+DOWNLOAD_LIMIT_BYTES = 32 * 1024 * 1024
+BYTES_PER_PIXEL = 4  # single band, float32 worst case
+# EE's metres-to-degrees factor for a scale in EPSG:4326 (equatorial WGS84)
+METRES_PER_DEGREE = 2 * math.pi * 6_378_137 / 360
+
+Tile = tuple[list[float], tuple[int, int]]
+
+
+def tile_grid(bounds: Sequence[float], scale_m: int,
+              bytes_per_pixel: int = BYTES_PER_PIXEL) -> list[Tile]:
+    """Split ``(west, south, east, north)`` into tiles under the download cap.
+
+    All tiles share one pixel grid, anchored at the north-west corner with
+    a pixel of *scale_m* metres in degrees. Each tile is returned as its
+    ``crs_transform`` (the grid's transform, shifted to the tile's first
+    pixel) and its ``(width, height)`` in pixels, so Earth Engine renders
+    exactly those pixels and the tiles line up in the mosaic.
+    """
+    west, south, east, north = bounds
+    px = scale_m / METRES_PER_DEGREE
+    width = math.ceil((east - west) / px)
+    height = math.ceil((north - south) / px)
+    side = int(math.sqrt(0.8 * DOWNLOAD_LIMIT_BYTES / bytes_per_pixel))
+    return [
+        ([px, 0.0, west + c0 * px, 0.0, -px, north - r0 * px],
+         (min(side, width - c0), min(side, height - r0)))
+        for r0 in range(0, height, side)
+        for c0 in range(0, width, side)
+    ]
+
+
+def wait_for_task(task: ee.batch.Task, poll_s: int = 15) -> dict:
+    """Poll *task* until it leaves the queue; return its final status.
+
+    Prints the elapsed time, state and attempt on every poll, so a job stuck
+    in READY (quota) or retrying (too many tiles) shows up early.
+    """
+    t0 = time.time()
+    while task.active():
+        st = task.status()
+        print(f"  {time.time() - t0:6.0f}s  state={st['state']}"
+              f"  attempt={st.get('attempt')}")
+        time.sleep(poll_s)
+
+    st = task.status()
+    print(f"  {time.time() - t0:6.0f}s  state={st['state']}")
+    if st["state"] == "COMPLETED":
+        for uri in st.get("destination_uris", []):
+            print(f"  ‣ output  : {uri}")
+    else:
+        print(f"  ‣ error   : {st.get('error_message', 'unknown')}")
+    return st
+
+
+def _fetch_tile(session: requests.Session, img: ee.Image, tile: Tile,
+                dest: Path) -> Path:
+    """Download one :func:`tile_grid` tile of *img* as GeoTIFF to *dest*."""
+    transform, (w, h) = tile
+    url = img.getDownloadURL({
+        "crs": "EPSG:4326",
+        "crs_transform": transform,
+        "dimensions": f"{w}x{h}",
+        "format": "GEO_TIFF",
+    })
+    with session.get(url, stream=True, timeout=600) as r:
+        r.raise_for_status()
+        with open(dest, "wb") as f:
+            for chunk in r.iter_content(chunk_size=1 << 20):
+                f.write(chunk)
+    return dest
+
+
+def download_tiles(img: ee.Image, bounds: Sequence[float], scale_m: int,
+                   name: str, max_workers: int = 8) -> Path:
+    """Fetch *img* over *bounds* tile by tile and mosaic it as ``name.vrt``.
+
+    Tiles are written to ``name_tiles/`` in the current directory. Returns
+    the VRT path, or the tile directory if ``gdalbuildvrt`` is unavailable.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    tiles = tile_grid(bounds, scale_m)
+    tile_dir = Path(f"{name}_tiles")
+    tile_dir.mkdir(exist_ok=True)
+
+    # one pooled session so the workers reuse HTTP connections
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_maxsize=max_workers))
+
+    paths = []
+    with session, ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(_fetch_tile, session, img, tile,
+                        tile_dir / f"{name}_{i:03d}.tif")
+            for i, tile in enumerate(tiles)
+        ]
+        for done, fut in enumerate(as_completed(futures), start=1):
+            paths.append(fut.result())
+            print(f"  ‣ tile {done}/{len(tiles)} downloaded")
+
+    if shutil.which("gdalbuildvrt") is None:
+        print("⚠️  gdalbuildvrt not found – tiles left unmosaicked")
+        return tile_dir
+
+    vrt = Path(f"{name}.vrt")
+    subprocess.run(["gdalbuildvrt", "-q", str(vrt), *map(str, sorted(paths))],
+                   check=True)
+    return vrt
+
+
+def export_image(img: ee.Image, name: str, scale_m: int, local: bool = False,
+                 wait: bool = False) -> None:
+    """Export *img* over the globe at *scale_m* metres/pixel as *name*.
+
+    Queues a Cloud-Optimized GeoTIFF export to the Drive folder
+    ``EE_exports``; with *wait*, polls it and exits non-zero unless it
+    completes. With *local*, downloads the image tile by tile instead.
+    Call after :func:`_ee_session.get_ee`.
+    """
+    import ee
+
+    bounds = [-180, -90, 180, 90]
+    if local:
+        print(f"→ Downloading '{name}' tile by tile at {scale_m} m/pixel")
+        out = download_tiles(img, bounds, scale_m, name)
+        print(f"✓ Saved: {out}")
+        return
+
+    # no img.clip(): the export region already crops the image
+    task = ee.batch.Export.image.toDrive(
+        image=img,
+        description=name,
+        folder="EE_exports",
+        fileNamePrefix=name,
+        region=ee.Geometry.Rectangle(bounds, "EPSG:4326", False),
+        scale=scale_m,
+        crs="EPSG:4326",
+        maxPixels=1_000_000_000,
+        fileFormat="GeoTIFF",
+        formatOptions={"cloudOptimized": True},
+    )
+    task.start()
+
+    print(
+        f"✓ Started Drive export '{name}'.\n"
+        f"  ‣ scale   : {scale_m} m/pixel\n"
+        f"  ‣ task id : {task.id}\n"
+        "Check the Earth Engine Tasks panel and wait for COMPLETED."
+    )
+
+    if wait:
+        st = wait_for_task(task)
+        if st["state"] != "COMPLETED":
+            raise SystemExit("❌  Export did not complete – retry, or use a "
+                             "coarser SCALE if it ran out of resources.")
+
+
+def positive_int(text: str) -> int:
+    """argparse type for SCALE: a positive integer number of metres."""
+    try:
+        value = int(text)
+        if value <= 0:
+            raise ValueError
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "SCALE must be a positive integer (metres per pixel).")
+    return value
+
+
+def parse_export_args(description: str) -> argparse.Namespace:
+    """Parse the ``SCALE [--no-hv] [--local | --wait]`` export command line."""
+    p = argparse.ArgumentParser(description=description)
+    p.add_argument("scale", type=positive_int, metavar="SCALE",
+                   help="Pixel size in metres (e.g. 10000)")
+
+    g = p.add_mutually_exclusive_group()
+    g.add_argument("--hv", dest="hv", action="store_true",
+                   help="Use the high-volume EE endpoint (default)")
+    g.add_argument("--no-hv", dest="hv", action="store_false",
+                   help="Use the standard EE endpoint")
+    p.set_defaults(hv=True)
+
+    m = p.add_mutually_exclusive_group()
+    m.add_argument("--local", action="store_true",
+                   help="Download tiles concurrently via getDownloadURL and "
+                        "mosaic them into a local VRT instead of exporting "
+                        "to Drive")
+    m.add_argument("--wait", action="store_true",
+                   help="Poll the export task and report progress until it "
+                        "finishes")
+    return p.parse_args()
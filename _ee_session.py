@@ -0,0 +1,67 @@
+"""_ee_session.py – one Earth Engine initialisation per process.
+
+The EE-using scripts get the ``ee`` module through :func:`get_ee` rather
+than calling ``ee.Initialize()`` themselves, so the OAuth token exchange
+happens at most once per interpreter, however many scripts or batches
+run in it. ``ee`` itself is only imported on the first call.
+
+The image builders shared by those scripts live here too; call
+:func:`get_ee` (with the script's ``--hv`` choice) before using them.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+# Earth Engine endpoint tuned for many concurrent requests (bulk work)
+HV_ENDPOINT = "https://earthengine-highvolume.googleapis.com"
+
+OISST_COLLECTION = "NOAA/CDR/OISST/V2_1"
+OISST_BAND = "sst"
+HYCOM_COLLECTION = "HYCOM/sea_temp_salinity"
+HYCOM_BAND = "water_temp_0"
+
+_initialized = False
+
+
+def get_ee(hv: bool = True):
+    """Return the ``ee`` module, initialising it on first use.
+
+    *hv* selects the high-volume endpoint; it only takes effect on the call
+    that initialises the session.
+    """
+    global _initialized
+    import ee
+
+    if not _initialized:
+        ee.Initialize(opt_url=HV_ENDPOINT if hv else None)
+        _initialized = True
+    return ee
+
+
+def _daily_image(collection: str, band: str, date_ymd: tuple[int, int, int]):
+    """Return *band* of the first *collection* image on *date_ymd*."""
+    import ee
+
+    d0 = ee.Date.fromYMD(*date_ymd)
+    return (
+        ee.ImageCollection(collection)
+        .filterDate(d0, d0.advance(1, "day"))
+        .first()
+        .select(band)
+    )
+
+
+@lru_cache(maxsize=None)
+def build_oisst_image(date_ymd: tuple[int, int, int]):
+    """Return daily OISST ``sst`` for *date_ymd* as a deferred ``ee.Image``.
+
+    Built once per process, so every batch reuses the same server-side graph.
+    """
+    return _daily_image(OISST_COLLECTION, OISST_BAND, date_ymd)
+
+
+@lru_cache(maxsize=None)
+def build_hycom_image(date_ymd: tuple[int, int, int]):
+    """Return HYCOM ``water_temp_0`` for *date_ymd* as a deferred ``ee.Image``."""
+    return _daily_image(HYCOM_COLLECTION, HYCOM_BAND, date_ymd)
@@ -0,0 +1,54 @@
+"""_tif_kernels.py – optional Numba kernels used by ``check_tif.py``.
+
+Kept in their own module so that ``numba`` (slow to import) is only loaded
+when a kernel is actually needed; ``check_tif`` falls back to plain NumPy
+when this module cannot be imported.
+"""
+
+from __future__ import annotations
+
+import numba
+import numpy as np
+
+
+# no fastmath: it would let the compiler assume away the NaN checks
+@numba.njit(parallel=True, cache=True)
+def stats_kernel(a, nodata, has_nodata, one, counts, sums, sums2, mins, maxs):
+    """Fill per-row count/sum/sum2/min/max of the valid cells of 2-D *a*.
+
+    *one* is ``1`` of the accumulator type (int64 for integers of up to
+    16 bits, float64 otherwise); multiplying by it widens each cell before summing.
+    """
+    for i in numba.prange(a.shape[0]):
+        for j in range(a.shape[1]):
+            v = a[i, j]
+            if v != v or (has_nodata and v == nodata):
+                continue
+            x = v * one
+            counts[i] += 1
+            sums[i] += x
+            sums2[i] += x * x
+            mins[i] = min(mins[i], x)
+            maxs[i] = max(maxs[i], x)
+
+
+# serial but GIL-free: callers run it on a thread pool, and Numba's parallel
+# (workqueue) runtime must not be entered from several threads at once
+@numba.njit(nogil=True, cache=True)
+def avg_kernel(block, sf, nodata, has_nodata, out):
+    """Write the mean of each valid *sf*×*sf* cell of *block* into *out*.
+
+    Cells with no valid pixel become NaN.
+    """
+    for i in range(out.shape[0]):
+        for j in range(out.shape[1]):
+            s = 0.0
+            k = 0
+            for di in range(sf):
+                for dj in range(sf):
+                    v = block[i * sf + di, j * sf + dj]
+                    if v != v or (has_nodata and v == nodata):
+                        continue
+                    s += v
+                    k += 1
+            out[i, j] = s / k if k else np.nan
@@ -3,37 +3,102 @@
 check_tif.py – quick GeoTIFF inspector
 
 Run:
-    python check_tif.py path/to/file.tif [--thumb] [--thumb-scale 0.2] [--show]
+    python check_tif.py path/to/file.tif [--thumb] [--thumb-scale 0.2] [--fast-stats]
+                                     [--zarr-cache DIR] [--show [--full-read]]
 
 What it does
 ------------
 1. Prints the raster metadata (driver, size, dtype, CRS, affine transform).
-2. Computes and prints basic statistics (min, max, mean, std dev).
+2. Computes and prints basic statistics (min, max, mean, std dev), reading
+   the raster one block window at a time.
 3. Saves a PNG thumbnail (default: 20 % of original size) next to the input
-   file – unless you pass ``--no-thumb``.
-4. Optionally displays the full-resolution raster with matplotlib
-   (``--show``).
+   file – unless you pass ``--no-thumb``. If the file has an overview
+   (``gdaladdo``) matching the scale, it is read instead of the full raster.
+   ``--fast-stats`` computes step 2 from this downsampled read as well.
+4. With ``--zarr-cache DIR``, stores the downsampled array (chunked Zarr)
+   with the metadata and statistics in its attributes. Later runs on an
+   unchanged file print from the cache and don't open the raster at all.
+5. Optionally displays the full-resolution raster with matplotlib
+   (``--show``). Rasters larger than ``FULL_READ_LIMIT`` pixels also need
+   ``--full-read``, as the whole band has to be loaded into memory.
 
-Dependencies: ``rasterio`` and ``matplotlib``.
+Dependencies: ``rasterio`` and ``Pillow``; ``matplotlib`` is only needed for
+``--show``, ``zarr`` only for ``--zarr-cache``, and ``numba`` optionally
+speeds up the statistics pass.
 Install with::
 
-    pip install rasterio matplotlib
+    pip install rasterio pillow matplotlib zarr numba
 
 """
 
 from __future__ import annotations
 
 import argparse
+import importlib.util
+import math
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import numpy as np
-import rasterio
-from rasterio.enums import Resampling
+if TYPE_CHECKING:  # annotations only; imported lazily at runtime
+    import numpy as np
+    import rasterio.io
 
-try:
-    import matplotlib.pyplot as plt
-except ImportError:
-    plt = None  # only needed when --show or when saving thumbnail
+# GDAL settings for the block-wise reads: a 512 MB block cache, internal
+# nodata masks, and no sibling-file directory listing on open
+GDAL_ENV = {
+    "GDAL_CACHEMAX": 512,
+    "GDAL_TIFF_INTERNAL_MASK": True,
+    "GDAL_DISABLE_READDIR_ON_OPEN": "EMPTY_DIR",
+}
+
+# threads for block_average; each holds one window (and a float32 copy)
+MAX_WORKERS = 8
+
+# block_average windows stay block-aligned up to this many blocks (or sf) a side
+WINDOW_SPAN = 4
+
+# read_thumbnail uses an overview within this fraction of 1/--thumb-scale
+OVERVIEW_TOLERANCE = 0.1
+
+# --show reads the whole band; above this many pixels it needs --full-read
+FULL_READ_LIMIT = 50_000_000
+
+
+# matplotlib's "turbo" colormap as 256 RGB triplets (uint8), so matplotlib
+# is not needed just to colour a thumbnail
+TURBO_HEX = (
+    "30123b31154232184a341b51351e5836215f37236538266c3929723a2c793b2f7f3c3285"
+    "3c358b3d37913e3a963f3d9c4040a14043a64145ab4148b0424bb5434eba4350be4353c2"
+    "4456c74458cb455bce455ed24560d64563d94666dd4668e0466be3466de64670e84673eb"
+    "4675ed4678f0467af2467df4467ff64682f84584f94587fb4589fc448cfd438efd4291fe"
+    "4193fe4096fe3f98fe3e9bfe3c9dfd3ba0fc39a2fc38a5fb36a8f934aaf833acf631aff5"
+    "2fb1f32db4f12bb6ef2ab9ed28bbeb26bde925c0e623c2e421c4e120c6df1ec9dc1dcbda"
+    "1ccdd71bcfd41ad1d219d3cf18d5cc18d7ca17d9c717dac417dcc217debf18e0bd18e1ba"
+    "19e3b81ae4b61be5b41de7b11ee8af20e9ac22eba924eca627eda329eea02cef9d2ff09a"
+    "32f19735f39438f4913bf48d3ff58a42f68746f7834af8804df97c51f97955fa7659fb72"
+    "5dfb6f61fc6c65fc6869fd656dfd6271fd5f74fe5c78fe597cfe5680fe5384fe5087fe4d"
+    "8bfe4b8efe4892fe4695fe4498fe429bfd409efd3ea1fc3da4fc3ba6fb3aa9fb39acfa37"
+    "aef937b1f836b3f835b6f735b9f534bbf434bef334c0f233c3f133c5ef33c8ee33caed33"
+    "cdeb34cfea34d1e834d4e735d6e535d8e335dae236dde036dfde36e1dc37e3da37e5d838"
+    "e7d738e8d538ead339ecd139edcf39efcd39f0cb3af2c83af3c63af4c43af6c23af7c039"
+    "f8be39f9bc39f9ba38fab737fbb537fbb336fcb035fcae34fdab33fda932fda631fda330"
+    "fea12ffe9e2efe9b2dfe982cfd952bfd9229fd8f28fd8c27fc8926fc8624fb8323fb8022"
+    "fa7d20fa7a1ff9771ef8741cf7711bf76e1af66b18f56817f46516f36315f26014f15d13"
+    "ef5a11ee5810ed550fec520eea500de94d0de84b0ce6490be5460ae3440ae24209e04008"
+    "de3e08dd3c07db3a07d93806d73606d63405d43205d23005d02f04ce2d04cb2b03c92903"
+    "c72803c52602c32402c02302be2102bb1f01b91e01b61c01b41b01b11901ae1801ac1601"
+    "a91501a61401a31201a011019d10019a0e01970d01940c01910b018e0a018b0901870801"
+    "8407018106027d05027a0402"
+)
+
+
+@lru_cache(maxsize=None)
+def _turbo_lut() -> np.ndarray:
+    """Return the 256-entry Turbo colormap as a ``(256, 3)`` uint8 LUT."""
+    import numpy as np
+
+    return np.frombuffer(bytes.fromhex(TURBO_HEX), dtype=np.uint8).reshape(256, 3)
 
 
 def parse_args() -> argparse.Namespace:
@@ -50,11 +115,366 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--thumb-scale", type=float, default=0.2,
                    metavar="FRACTION",
                    help="Scale factor for thumbnail (0‒1, default 0.2)")
+    p.add_argument("--fast-stats", action="store_true",
+                   help="Compute statistics from the thumbnail-sized read "
+                        "instead of the full raster (approximate)")
+    p.add_argument("--zarr-cache", type=Path, default=None, metavar="DIR",
+                   help="Cache the thumbnail array and statistics in a Zarr "
+                        "store under DIR; later runs reuse it while the "
+                        "TIFF is unchanged")
     p.add_argument("--show", action="store_true",
                    help="Display the image with matplotlib")
+    p.add_argument("--full-read", action="store_true",
+                   help="Allow --show to load the whole band on huge files")
     return p.parse_args()
 
 
+def _acc_dtype(dtype: np.dtype) -> type:
+    """Accumulator type for sums over *dtype*.
+
+    Integers of at most 16 bits (e.g. OISST's int16) are summed exactly in
+    int64; wider integers would overflow its sum of squares, so they and
+    floats use float64.
+    """
+    import numpy as np
+
+    if np.issubdtype(dtype, np.integer) and np.dtype(dtype).itemsize <= 2:
+        return np.int64
+    return np.float64
+
+
+def _accumulate(a: np.ndarray) -> tuple[int, float, float, float, float]:
+    """Return ``(count, sum, sum2, min, max)`` over the valid cells of *a*.
+
+    *a* is a masked array when the raster has nodata, and a plain array
+    otherwise; NaN cells of float data are skipped either way. Sums use the
+    :func:`_acc_dtype` accumulator, exact for narrow integers. The sum of
+    squares is a fused ``einsum`` dot product, so no squared temporary the
+    size of *a* is allocated.
+    """
+    import numpy as np
+
+    flat = a.compressed() if np.ma.isMaskedArray(a) else a.ravel()
+    if np.issubdtype(flat.dtype, np.floating):
+        flat = flat[~np.isnan(flat)]  # NaN is nodata too, as in stats_kernel
+    if flat.size == 0:
+        return 0, 0, 0, np.inf, -np.inf
+    acc = _acc_dtype(flat.dtype)
+    return (
+        flat.size,
+        flat.sum(dtype=acc).item(),
+        np.einsum("i,i->", flat, flat, dtype=acc, casting="same_kind").item(),
+        float(flat.min()),
+        float(flat.max()),
+    )
+
+
+@lru_cache(maxsize=None)
+def _kernels():
+    """Return the :mod:`_tif_kernels` module, or None without Numba."""
+    try:
+        import _tif_kernels
+    except ImportError:
+        return None  # optional: single-pass parallel statistics kernel
+    return _tif_kernels
+
+
+def _accumulate_raw(a: np.ndarray, nodata: float | None) -> tuple[int, float, float, float, float]:
+    """Like :func:`_accumulate`, but on a raw array in one Numba pass.
+
+    Cells equal to *nodata* or NaN are skipped without building a mask.
+    """
+    import numpy as np
+
+    rows = a.shape[0]
+    acc = _acc_dtype(a.dtype)
+    counts = np.zeros(rows, dtype=np.int64)
+    sums = np.zeros(rows, dtype=acc)
+    sums2 = np.zeros(rows, dtype=acc)
+    mins = np.full(rows, np.inf)
+    maxs = np.full(rows, -np.inf)
+    _kernels().stats_kernel(a, 0.0 if nodata is None else float(nodata), nodata is not None,
+                            acc(1), counts, sums, sums2, mins, maxs)
+    return (int(counts.sum()), sums.sum().item(), sums2.sum().item(),
+            float(mins.min()), float(maxs.max()))
+
+
+def _finalize(n: int, s: float, s2: float, mn: float, mx: float,
+              scale: float = 1.0, offset: float = 0.0) -> dict[str, float]:
+    """Turn accumulated moments into min/max/mean/std.
+
+    Integer sums (Python ints) give an exact variance; the raster's
+    *scale*/*offset* are applied only to the final values.
+    """
+    if n == 0:
+        return {"min": math.nan, "max": math.nan, "mean": math.nan, "std": math.nan}
+    if isinstance(s, int) and isinstance(s2, int):
+        var = (n * s2 - s * s) / (n * n)
+    else:
+        var = s2 / n - (s / n) ** 2
+    lo, hi = sorted((mn * scale + offset, mx * scale + offset))
+    return {
+        "min": lo,
+        "max": hi,
+        "mean": s / n * scale + offset,
+        "std": math.sqrt(max(var, 0.0)) * abs(scale),
+    }
+
+
+def band_stats(ds: rasterio.io.DatasetReader) -> dict[str, float]:
+    """Compute min/max/mean/std of band 1 block by block.
+
+    Reads follow ``ds.block_windows``, so each is aligned to the file's
+    internal tiles/strips and only one block is held in memory at a time;
+    count, sum and sum of squares are accumulated (exactly, for 8/16-bit
+    integers) and the std is derived as ``sqrt(sum2/n - mean**2)``. Values are
+    reported after the band's scale/offset. With Numba installed each block
+    is reduced in a single parallel pass over the raw data.
+    """
+    kernels = _kernels()
+    n = s = s2 = 0
+    mn, mx = math.inf, -math.inf
+    for _, win in ds.block_windows(1):
+        if kernels is not None:
+            part = _accumulate_raw(ds.read(1, window=win), ds.nodata)
+        else:
+            part = _accumulate(ds.read(1, window=win, masked=ds.nodata is not None))
+        k, bs, bs2, bmn, bmx = part
+        n += k
+        s += bs
+        s2 += bs2
+        mn = min(mn, bmn)
+        mx = max(mx, bmx)
+    return _finalize(n, s, s2, mn, mx, ds.scales[0], ds.offsets[0])
+
+
+def array_stats(a: np.ndarray, scale: float = 1.0, offset: float = 0.0) -> dict[str, float]:
+    """Compute min/max/mean/std of an in-memory (optionally masked) array."""
+    return _finalize(*_accumulate(a), scale, offset)
+
+
+def _average_numpy(block: np.ndarray, sf: int, nodata: float | None,
+                   out: np.ndarray) -> None:
+    """NumPy fallback for ``_tif_kernels.avg_kernel``."""
+    import numpy as np
+
+    h, w = out.shape
+    b = block[:h * sf, :w * sf].astype(np.float32).reshape(h, sf, w, sf)
+    if nodata is not None:
+        b[b == nodata] = np.nan
+    valid = ~np.isnan(b)
+    k = valid.sum(axis=(1, 3))
+    s = np.where(valid, b, 0.0).sum(axis=(1, 3))
+    out[:] = np.where(k > 0, s / np.maximum(k, 1), np.nan)
+
+
+def _window_side(block: int, sf: int) -> int:
+    """Side of a :func:`block_average` window along one axis.
+
+    ``lcm(block, sf)`` starts and ends on block boundaries, so no block is
+    decoded by two threads. When *sf* is nearly coprime to the block size
+    that can be huge, so beyond ``WINDOW_SPAN`` blocks the largest multiple
+    of *sf* within one block is used instead, and boundary blocks are
+    occasionally decoded twice.
+    """
+    side = math.lcm(block, sf)
+    if side <= WINDOW_SPAN * max(block, sf):
+        return side
+    return sf * max(1, block // sf)
+
+
+def block_average(ds: rasterio.io.DatasetReader, sf: int) -> np.ndarray:
+    """Average band 1 over *sf*×*sf* cells, reading windows in parallel.
+
+    Windows are a multiple of *sf* on each side (see :func:`_window_side`)
+    and are read and reduced on a thread pool of at most ``MAX_WORKERS`` –
+    GDAL releases the GIL while reading, and the Numba kernel (if
+    available) releases it while averaging. Each thread opens its own
+    handle under ``GDAL_ENV``, as a rasterio dataset is not thread-safe
+    and its environment is thread-local. Returns float32 with NaN where a
+    cell has no valid pixel.
+    """
+    import os
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    import numpy as np
+    import rasterio
+    from rasterio.windows import Window
+
+    sf = max(1, min(sf, ds.height, ds.width))
+    out_h, out_w = ds.height // sf, ds.width // sf
+    out = np.empty((out_h, out_w), dtype=np.float32)
+    bh, bw = ds.block_shapes[0]
+    win_h, win_w = _window_side(bh, sf), _window_side(bw, sf)
+    nodata = ds.nodata
+    kernels = _kernels()
+
+    local = threading.local()
+    handles = []
+
+    def work(origin: tuple[int, int]) -> None:
+        r0, c0 = origin
+        src = getattr(local, "ds", None)
+        if src is None:
+            with rasterio.Env(**GDAL_ENV):
+                src = local.ds = rasterio.open(ds.name)
+            handles.append(src)
+        nrows = min(win_h, out_h * sf - r0)
+        ncols = min(win_w, out_w * sf - c0)
+        block = src.read(1, window=Window(c0, r0, ncols, nrows))
+        dest = out[r0 // sf:(r0 + nrows) // sf, c0 // sf:(c0 + ncols) // sf]
+        if kernels is not None:
+            kernels.avg_kernel(block, sf, 0.0 if nodata is None else float(nodata),
+                               nodata is not None, dest)
+        else:
+            _average_numpy(block, sf, nodata, dest)
+
+    origins = [(r0, c0) for r0 in range(0, out_h * sf, win_h)
+               for c0 in range(0, out_w * sf, win_w)]
+    try:
+        with ThreadPoolExecutor(max_workers=min(os.cpu_count() or 1, MAX_WORKERS)) as pool:
+            list(pool.map(work, origins))
+    finally:
+        for src in handles:
+            src.close()
+    return out
+
+
+def read_thumbnail(ds: rasterio.io.DatasetReader, scale: float) -> np.ndarray:
+    """Read band 1 downsampled by roughly *scale*.
+
+    If the file carries an overview within ``OVERVIEW_TOLERANCE`` of
+    ``1/scale`` (and ``1/scale`` is not closer to full resolution), it is
+    read directly with nearest-neighbour sampling (the overview is already
+    averaged), touching only a fraction of the bytes. Otherwise every source
+    pixel is averaged over ``round(1/scale)`` cells: in parallel by
+    :func:`block_average` with Numba, else by GDAL's average resampling.
+    """
+    import numpy as np
+    from rasterio.enums import Resampling
+
+    target = 1 / scale
+    ovr = ds.overviews(1)
+    f = min([1, *ovr], key=lambda x: abs(x - target))
+    if f != 1 and abs(f - target) <= OVERVIEW_TOLERANCE * target:
+        out_shape = (1, max(ds.height // f, 1), max(ds.width // f, 1))
+        thumb = ds.read(1, out_shape=out_shape, resampling=Resampling.nearest)
+        if ds.nodata is not None:
+            thumb = np.ma.masked_equal(thumb, ds.nodata)
+        return thumb
+
+    if not ovr:
+        print("ℹ️  No overviews found – run "
+              f"`gdaladdo -r average {ds.name} 2 4 8 16` once to speed up "
+              "future thumbnails")
+    sf = max(1, min(int(round(target)), ds.height, ds.width))
+    if _kernels() is not None:
+        thumb = block_average(ds, sf)
+        return np.ma.masked_invalid(thumb) if np.isnan(thumb).any() else thumb
+
+    # without Numba, GDAL's own average resampling beats the NumPy fallback
+    out_shape = (1, ds.height // sf, ds.width // sf)
+    return ds.read(1, out_shape=out_shape, resampling=Resampling.average,
+                   masked=ds.nodata is not None)
+
+
+def save_thumbnail(thumb: np.ndarray, path: Path) -> None:
+    """Colour *thumb* with Turbo and write it to *path* as PNG.
+
+    The value range is stretched to the LUT like ``plt.imsave`` does;
+    masked and NaN cells become transparent.
+    """
+    import numpy as np
+    from PIL import Image
+
+    data = np.ma.getdata(thumb).astype(np.float64)
+    valid = ~np.ma.getmaskarray(thumb) & np.isfinite(data)
+    if valid.any():
+        vmin, vmax = data[valid].min(), data[valid].max()
+    else:
+        vmin = vmax = 0.0
+    span = (vmax - vmin) or 1.0
+
+    # same binning as matplotlib: 256 equal bins, the maximum in the last
+    norm = np.clip((np.where(valid, data, vmin) - vmin) / span * 256, 0, 255)
+    rgb = _turbo_lut()[norm.astype(np.uint8)]
+    if valid.all():
+        img = Image.fromarray(rgb)
+    else:
+        alpha = np.where(valid, 255, 0).astype(np.uint8)
+        img = Image.fromarray(np.dstack([rgb, alpha]))
+    img.save(path, "PNG", compress_level=1)
+
+
+def print_metadata(metadata: dict[str, str]) -> None:
+    print("\n— Metadata —")
+    for k, v in metadata.items():
+        print(f"{k:>10}: {v}")
+
+
+def print_stats(stats: dict[str, float]) -> None:
+    print("\n— Statistics —")
+    for k, v in stats.items():
+        print(f"{k:>4}: {v:0.3f}")
+
+
+def _zarr_store(cache_dir: Path, path: Path) -> Path:
+    """Store for *path* under *cache_dir*, unique per resolved source path."""
+    import hashlib
+
+    digest = hashlib.sha1(str(path).encode()).hexdigest()[:8]
+    return cache_dir / f"{path.stem}-{digest}.zarr"
+
+
+def load_zarr_cache(cache_dir: Path, path: Path,
+                    key: dict) -> tuple[dict, dict, np.ndarray] | None:
+    """Return ``(metadata, stats, thumb)`` cached for *path*, if still valid.
+
+    An entry is valid when it was written for the same source path, size
+    and mtime, thumbnail scale and stats mode (*key*).
+    """
+    try:
+        import zarr
+    except ImportError:
+        return None
+    store = _zarr_store(cache_dir, path)
+    if not store.exists():
+        return None
+    try:
+        z = zarr.open_array(store, mode="r")
+        attrs = z.attrs.asdict()
+    except Exception:
+        return None  # unreadable cache – rebuild it
+    if attrs.get("key") != key:
+        return None
+    return attrs["metadata"], attrs["stats"], z[:]
+
+
+def save_zarr_cache(cache_dir: Path, path: Path, key: dict,
+                    metadata: dict, stats: dict, thumb: np.ndarray) -> Path:
+    """Store the thumbnail array (float32, NaN = nodata) plus metadata/stats."""
+    import numpy as np
+    import zarr
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    store = _zarr_store(cache_dir, path)
+    data = np.ma.filled(np.ma.asarray(thumb, dtype=np.float32), np.nan)
+    z = zarr.open_array(store, mode="w", shape=data.shape, chunks=(256, 256),
+                        dtype="f4", fill_value=np.nan)
+    z[:] = data
+    z.attrs.update({"key": key, "metadata": metadata, "stats": stats})
+    return store
+
+
+def _write_thumbnail(thumb: np.ndarray, thumb_path: Path) -> None:
+    if importlib.util.find_spec("PIL") is None:
+        print("⚠️  Pillow not available – cannot save thumbnail")
+    else:
+        save_thumbnail(thumb, thumb_path)
+        print(f"✓  Thumbnail saved: {thumb_path}")
+
+
 def main() -> None:
     args = parse_args()
     path: Path = args.tif.expanduser().resolve()
@@ -62,51 +482,81 @@ def main() -> None:
     if not path.exists():
         raise SystemExit(f"❌  File not found: {path}")
 
-    with rasterio.open(path) as ds:
-        print("\n— Metadata —")
+    scale = max(min(args.thumb_scale, 1.0), 0.01)
+    thumb_path = path.with_suffix("") .with_name(path.stem + "_thumb.png")
+    cache_dir = args.zarr_cache.expanduser() if args.zarr_cache else None
+    st = path.stat()
+    cache_key = {
+        "source": str(path),
+        "source_size": st.st_size,
+        "source_mtime_ns": st.st_mtime_ns,
+        "thumb_scale": scale,
+        "fast_stats": args.fast_stats,
+    }
+
+    # a fresh cache entry answers everything except --show without the raster
+    if cache_dir is not None and not args.show:
+        cached = load_zarr_cache(cache_dir, path, cache_key)
+        if cached is not None:
+            metadata, stats, thumb = cached
+            print(f"ℹ️  Using cached results from {cache_dir}")
+            print_metadata(metadata)
+            print_stats(stats)
+            if args.thumb:
+                # re-render: an existing PNG may be from another --thumb-scale
+                _write_thumbnail(thumb, thumb_path)
+            return
+
+    import rasterio
+
+    with rasterio.Env(**GDAL_ENV), rasterio.open(path) as ds:
         profile = ds.profile.copy()
-        for k in (
-            "driver", "dtype", "width", "height", "count",
-            "crs", "transform"):
-            print(f"{k:>10}: {profile.get(k)}")
-
-        # read first band as masked array
-        data = ds.read(1, masked=True)
-        stats = {
-            "min": np.nanmin(data),
-            "max": np.nanmax(data),
-            "mean": np.nanmean(data),
-            "std": np.nanstd(data),
+        metadata = {
+            k: str(profile.get(k))
+            for k in ("driver", "dtype", "width", "height", "count",
+                      "crs", "transform")
         }
-        print("\n— Statistics —")
-        for k, v in stats.items():
-            print(f"{k:>4}: {v:0.3f}")
+        bh, bw = ds.block_shapes[0]
+        metadata["blocks"] = f"{bh}×{bw}"
+        print_metadata(metadata)
+
+        # downsampled band, shared by the thumbnail, --fast-stats and the cache
+        thumb = None
+        if args.thumb or args.fast_stats or cache_dir is not None:
+            thumb = read_thumbnail(ds, scale)
+
+        if args.fast_stats:
+            stats = array_stats(thumb, ds.scales[0], ds.offsets[0])
+        else:
+            # first band, one block window at a time
+            stats = band_stats(ds)
+        print_stats(stats)
 
         # optional thumbnail
         if args.thumb:
-            if plt is None:
-                print("⚠️  matplotlib not available – cannot save thumbnail")
-            else:
-                scale = max(min(args.thumb_scale, 1.0), 0.01)
-                new_h = int(ds.height * scale)
-                new_w = int(ds.width * scale)
+            _write_thumbnail(thumb, thumb_path)
 
-                thumb = ds.read(
-                    1,
-                    out_shape=(1, new_h, new_w),
-                    resampling=Resampling.average,
-                )
-                thumb = np.ma.masked_equal(thumb, ds.nodata) if ds.nodata is not None else thumb
-
-                thumb_path = path.with_suffix("") .with_name(path.stem + "_thumb.png")
-                plt.imsave(thumb_path, thumb, cmap="turbo")
-                print(f"✓  Thumbnail saved: {thumb_path}")
+        if cache_dir is not None:
+            if importlib.util.find_spec("zarr") is None:
+                print("⚠️  zarr not available – cannot write cache")
+            else:
+                store = save_zarr_cache(cache_dir, path, cache_key,
+                                        metadata, stats, thumb)
+                print(f"✓  Cache written: {store}")
 
         # optional interactive display
         if args.show:
+            try:
+                import matplotlib.pyplot as plt
+            except ImportError:
+                plt = None
             if plt is None:
                 print("⚠️  matplotlib not available – cannot display image")
+            elif ds.width * ds.height > FULL_READ_LIMIT and not args.full_read:
+                print(f"⚠️  {ds.width}×{ds.height} raster is too large to "
+                      "display in full – pass --full-read to load it anyway")
             else:
+                data = ds.read(1, masked=ds.nodata is not None)
                 plt.figure(figsize=(8, 4))
                 plt.imshow(data, cmap="turbo")
                 plt.colorbar(label="Value")
@@ -5,6 +5,7 @@ and from a locally exported GeoTIFF at the same pixel scale.
 Usage
 -----
     python compare_sst.py LON LAT SCALE
+    python compare_sst.py --csv POINTS.csv SCALE [--out DIFF.csv]
 
 Arguments
 ~~~~~~~~~
@@ -16,11 +17,26 @@ SCALE   Pixel size in **metres** that matches the GeoTIFF you exported.
             oisst_20200315_s{SCALE/1000}k.tif
 
         in the current directory (or provide a FULL path via the optional
-        ``--file`` flag).
+        ``--file`` flag). The exports are Cloud-Optimized GeoTIFFs, so only
+        the internal tile holding the point is read – and if the file is
+        served over HTTP, GDAL's ``/vsicurl/`` range-requests just that tile.
+--csv   Compare every point in a CSV with ``lon`` and ``lat`` columns instead
+        of a single LON LAT. Points are fetched from Earth Engine in batches
+        of up to 5000 (repeats are sent once) and sampled from the TIFF in
+        one pass; the result is written to ``--out`` (default
+        ``POINTS_diff.csv``) with columns ``lon,lat,ee,tif,diff`` in raw
+        units (°C × 100).
+--hv    Query the high-volume Earth Engine endpoint. Off by default: a single
+        point lookup is latency-bound, not throughput-bound.
+
+Earth Engine values are cached in ``~/.cache/gee_scale/ee_values.sqlite``,
+so repeating a comparison doesn't go back to the server; ``--no-cache``
+bypasses it and ``--verbose`` reports hits and misses.
 
 Example
 ~~~~~~~
     python compare_sst.py 150 20 20000
+    python compare_sst.py --csv buoys.csv 20000
 
 Dependencies
 ~~~~~~~~~~~~
@@ -31,92 +47,294 @@ Dependencies
 from __future__ import annotations
 
 import argparse
+import csv
+from collections.abc import Sequence
+from functools import lru_cache
 from pathlib import Path
+import math
+import sqlite3
 import sys
+from typing import TYPE_CHECKING
+
+from _ee_session import OISST_BAND, OISST_COLLECTION, build_oisst_image, get_ee
 
-import ee
-import numpy as np
-import rasterio
+if TYPE_CHECKING:  # annotations only; imported lazily at runtime
+    import numpy as np
+    import rasterio.io
 
 # ────────────────────────────────────────────────────────────────────────
 
+# on-disk cache of EE point values, keyed on (collection, band, date, lon, lat, scale)
+CACHE_PATH = Path("~/.cache/gee_scale/ee_values.sqlite").expanduser()
+
+OISST_DATE = (2020, 3, 15)
+SST_SCALE = 0.01  # OISST stores SST as int16 hundredths of °C
+
+# getInfo() refuses collections of more than 5000 elements
+EE_BATCH_LIMIT = 5000
+
+# batched TIFF lookups read the points' bounding window in one go if it has
+# at most this many pixels, else they sample block by block
+WINDOW_READ_LIMIT = 1 << 20
+
+
 def make_default_fname(scale_m: int) -> Path:
     """Return default TIFF name based on *scale_m* (metres)."""
     tag = f"s{scale_m // 1000}k"  # s20k, s250k, …
     return Path(f"oisst_20200315_{tag}.tif")
 
 
-def ee_sst_value(lon: float, lat: float, scale_m: int) -> float:
-    """Fetch SST *100 value from Earth Engine at lon/lat for 2020-03-15."""
-    ee.Initialize()
-    d0 = ee.Date.fromYMD(2020, 3, 15)
-    img = (
-        ee.ImageCollection("NOAA/CDR/OISST/V2_1")
-        .filterDate(d0, d0.advance(1, "day"))
-        .first()
-        .select("sst")
-    )
-    point = ee.Geometry.Point(lon, lat)
-    val = (
-        img.reduceRegion(
+def _query_ee(points: Sequence[tuple[float, float]], scale_m: int,
+              hv: bool = False) -> list[float | None]:
+    """Reduce the OISST image at each (lon, lat) with ``reduceRegions``.
+
+    Repeated points are sent once, and the unique points go out in
+    batches of at most ``EE_BATCH_LIMIT`` (one ``getInfo()`` each). Returns
+    one value per input point, ``None`` where the image is masked.
+    """
+    ee = get_ee(hv)
+    img = build_oisst_image(OISST_DATE)
+    unique = list(dict.fromkeys((float(lon), float(lat)) for lon, lat in points))
+
+    found: dict[tuple[float, float], float | None] = {}
+    for i in range(0, len(unique), EE_BATCH_LIMIT):
+        batch = unique[i:i + EE_BATCH_LIMIT]
+        fc = ee.FeatureCollection(
+            [ee.Feature(ee.Geometry.Point(lon, lat)) for lon, lat in batch]
+        )
+        res = img.reduceRegions(
+            collection=fc,
             reducer=ee.Reducer.first(),
-            geometry=point,
             scale=scale_m,
-            bestEffort=True,
-        )
-        .get("sst")
-        .getInfo()
+        ).getInfo()
+        found.update(zip(batch, (f["properties"].get("first") for f in res["features"])))
+    return [found[(float(lon), float(lat))] for lon, lat in points]
+
+
+def _cache_connect() -> sqlite3.Connection:
+    """Open (creating if needed) the persistent EE value cache."""
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(CACHE_PATH)
+    con.execute(
+        "CREATE TABLE IF NOT EXISTS ee_values ("
+        " collection TEXT, band TEXT, date TEXT,"
+        " lon REAL, lat REAL, scale INTEGER, value REAL,"
+        " PRIMARY KEY (collection, band, date, lon, lat, scale))"
     )
-    return float(val) if val is not None else np.nan
+    return con
 
 
-def tiff_sst_value(path: Path, lon: float, lat: float) -> float:
-    """Read SST value from GeoTIFF at lon/lat (nearest pixel)."""
+def ee_sst_values(points: Sequence[tuple[float, float]], scale_m: int,
+                  hv: bool = False, use_cache: bool = True,
+                  verbose: bool = False) -> np.ndarray:
+    """Fetch SST *100 values from Earth Engine at each (lon, lat) for 2020-03-15.
+
+    Values already in the on-disk cache (``CACHE_PATH``) are returned
+    without contacting Earth Engine. The remaining points are reduced
+    server-side by :func:`_query_ee` (one ``getInfo()`` round-trip per
+    ``EE_BATCH_LIMIT`` unique points), then stored in the cache.
+    """
+    import numpy as np
+
+    points = [(float(lon), float(lat)) for lon, lat in points]
+    if not use_cache:
+        vals = _query_ee(points, scale_m, hv)
+        return np.array([np.nan if v is None else v for v in vals], dtype=np.float64)
+
+    date = "{:04d}-{:02d}-{:02d}".format(*OISST_DATE)
+    key = (OISST_COLLECTION, OISST_BAND, date)
+    vals: list[float | None] = [None] * len(points)
+    with _cache_connect() as con:
+        missing = []
+        for i, (lon, lat) in enumerate(points):
+            row = con.execute(
+                "SELECT value FROM ee_values WHERE collection = ? AND band = ?"
+                " AND date = ? AND lon = ? AND lat = ? AND scale = ?",
+                (*key, lon, lat, scale_m),
+            ).fetchone()
+            if row is None:
+                missing.append(i)
+            else:
+                vals[i] = row[0]
+
+        if verbose:
+            print(f"  EE cache: {len(points) - len(missing)} hit(s), "
+                  f"{len(missing)} miss(es)  [{CACHE_PATH}]")
+
+        if missing:
+            fetched = _query_ee([points[i] for i in missing], scale_m, hv)
+            con.executemany(
+                "INSERT OR REPLACE INTO ee_values VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(*key, *points[i], scale_m, v) for i, v in zip(missing, fetched)],
+            )
+            for i, v in zip(missing, fetched):
+                vals[i] = v
+    con.close()
+
+    return np.array([np.nan if v is None else v for v in vals], dtype=np.float64)
+
+
+def ee_sst_value(lon: float, lat: float, scale_m: int, hv: bool = False,
+                 use_cache: bool = True, verbose: bool = False) -> float:
+    """Fetch SST *100 value from Earth Engine at lon/lat for 2020-03-15."""
+    return float(ee_sst_values([(lon, lat)], scale_m, hv, use_cache, verbose)[0])
+
+
+@lru_cache(maxsize=None)
+def _open_tiff(path: Path) -> rasterio.io.DatasetReader:
+    """Open *path* once per process so repeated lookups share the handle."""
+    import rasterio
+
     if not path.exists():
         sys.exit(f"❌  TIFF not found: {path}")
-    with rasterio.open(path) as ds:
-        if ds.crs.to_epsg() != 4326:
-            sys.exit("❌  TIFF CRS is not EPSG:4326 – re-project or adjust code.")
-        row, col = ds.index(lon, lat)
-        data = ds.read(1)
-        val = data[row, col]
-        # handle nodata
-        nodata = ds.nodata
-        if nodata is not None and np.isclose(val, nodata):
-            return np.nan
-        return float(val)
+    with rasterio.Env(GDAL_DISABLE_READDIR_ON_OPEN="EMPTY_DIR"):
+        ds = rasterio.open(path)
+    if ds.crs.to_epsg() != 4326:
+        sys.exit("❌  TIFF CRS is not EPSG:4326 – re-project or adjust code.")
+    return ds
+
+
+def tiff_sst_values(path: Path, points: Sequence[tuple[float, float]]) -> np.ndarray:
+    """Read SST values from GeoTIFF at each (lon, lat) in *points*.
+
+    Pixel rows/cols for all points come from one vectorised inverse-affine
+    transform. If the points span a small window it is read once and
+    indexed locally; otherwise a single ``ds.sample`` call reads only the
+    blocks containing them. Nodata and out-of-raster points come back as NaN.
+    """
+    import numpy as np
+    from rasterio.transform import rowcol
+    from rasterio.windows import Window
+
+    ds = _open_tiff(path)
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    rows, cols = rowcol(ds.transform, pts[:, 0], pts[:, 1])
+    rows = np.asarray(rows, dtype=np.intp)
+    cols = np.asarray(cols, dtype=np.intp)
+    inside = (rows >= 0) & (rows < ds.height) & (cols >= 0) & (cols < ds.width)
+
+    vals = np.full(len(pts), np.nan)
+    if inside.any():
+        r, c = rows[inside], cols[inside]
+        r0, c0 = r.min(), c.min()
+        h, w = r.max() - r0 + 1, c.max() - c0 + 1
+        if h * w <= WINDOW_READ_LIMIT:
+            block = ds.read(1, window=Window(c0, r0, w, h))
+            vals[inside] = block[r - r0, c - c0]
+        else:
+            vals[inside] = [v[0] for v in ds.sample(pts[inside], indexes=1)]
+
+    nodata = ds.nodata
+    if nodata is not None:
+        vals[np.isclose(vals, nodata)] = np.nan
+    return vals
+
+
+def tiff_sst_value(path: Path, lon: float, lat: float) -> float:
+    """Read SST value from GeoTIFF at lon/lat (nearest pixel)."""
+    return float(tiff_sst_values(path, [(lon, lat)])[0])
 
 
 # ─── CLI ────────────────────────────────────────────────────────────────
 
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Compare OISST SST value from EE and GeoTIFF.")
-    p.add_argument("lon", type=float, help="Longitude in degrees (-180 … 180)")
-    p.add_argument("lat", type=float, help="Latitude in degrees (-90 … 90)")
+    p.add_argument("lon", type=float, nargs="?",
+                   help="Longitude in degrees (-180 … 180)")
+    p.add_argument("lat", type=float, nargs="?",
+                   help="Latitude in degrees (-90 … 90)")
     p.add_argument("scale", type=int, help="Pixel scale in metres")
     p.add_argument("--file", type=Path, default=None,
                    help="Path to GeoTIFF (default based on scale)")
-    return p.parse_args()
+    p.add_argument("--csv", type=Path, default=None,
+                   help="CSV of points (lon,lat columns) to compare in one batch")
+    p.add_argument("--out", type=Path, default=None,
+                   help="Output CSV for --csv (default: <csv stem>_diff.csv)")
+
+    g = p.add_mutually_exclusive_group()
+    g.add_argument("--hv", dest="hv", action="store_true",
+                   help="Use the high-volume EE endpoint")
+    g.add_argument("--no-hv", dest="hv", action="store_false",
+                   help="Use the standard EE endpoint (default)")
+    p.set_defaults(hv=False)
+
+    p.add_argument("--no-cache", dest="cache", action="store_false",
+                   help="Always query Earth Engine, bypassing the local cache")
+    p.add_argument("--verbose", action="store_true",
+                   help="Report EE cache hits and misses")
+
+    args = p.parse_args()
+    if args.csv is None and (args.lon is None or args.lat is None):
+        p.error("give LON LAT, or --csv POINTS.csv")
+    if args.csv is not None and args.lon is not None:
+        p.error("LON LAT and --csv are mutually exclusive")
+    return args
+
+
+def read_points(path: Path) -> list[tuple[float, float]]:
+    """Read (lon, lat) pairs from the ``lon``/``lat`` columns of a CSV."""
+    if not path.exists():
+        sys.exit(f"❌  CSV not found: {path}")
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        if not {"lon", "lat"} <= set(reader.fieldnames or ()):
+            sys.exit(f"❌  {path} needs 'lon' and 'lat' columns")
+        return [(float(row["lon"]), float(row["lat"])) for row in reader]
+
+
+def write_diff(path: Path, points: Sequence[tuple[float, float]],
+               ee_vals: np.ndarray, tif_vals: np.ndarray) -> None:
+    """Write per-point EE/TIFF values and their difference to *path*."""
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["lon", "lat", "ee", "tif", "diff"])
+        for (lon, lat), e, t in zip(points, ee_vals, tif_vals):
+            w.writerow([lon, lat, e, t, t - e])
 
 
 def main() -> None:
     args = parse_args()
-    lon, lat, scale_m = args.lon, args.lat, args.scale
+    import numpy as np
+
+    scale_m = args.scale
     tiff_path = args.file or make_default_fname(scale_m)
 
-    print(f"→ Comparing SST at lon={lon}, lat={lat}, scale={scale_m} m")
+    # a single LON LAT is just a batch of one
+    if args.csv is not None:
+        points = read_points(args.csv)
+        print(f"→ Comparing SST at {len(points)} points from {args.csv}, "
+              f"scale={scale_m} m")
+    else:
+        points = [(args.lon, args.lat)]
+        print(f"→ Comparing SST at lon={args.lon}, lat={args.lat}, scale={scale_m} m")
     print(f"  GeoTIFF : {tiff_path}\n")
 
-    ee_val = ee_sst_value(lon, lat, scale_m)
-    tif_val = tiff_sst_value(tiff_path, lon, lat)
+    ee_vals = ee_sst_values(points, scale_m, hv=args.hv,
+                            use_cache=args.cache, verbose=args.verbose)
+    tif_vals = tiff_sst_values(tiff_path, points)
+
+    if args.csv is not None:
+        out = args.out or args.csv.with_name(args.csv.stem + "_diff.csv")
+        write_diff(out, points, ee_vals, tif_vals)
+        diff = tif_vals - ee_vals
+        valid = ~np.isnan(diff)
+        print(f"✓  {int(valid.sum())}/{len(points)} points with both values; "
+              f"wrote {out}")
+        if valid.any():
+            mad = np.abs(diff[valid]).mean()
+            print(f"  mean |TIFF − EE| : {mad:.2f} ({mad * SST_SCALE:.2f} °C)")
+        return
+
+    ee_val, tif_val = float(ee_vals[0]), float(tif_vals[0])
 
-    print("EE  value :", ee_val)
-    print("TIFF value:", tif_val)
-    if np.isnan(ee_val) or np.isnan(tif_val):
+    # values stay in raw int16 units; scale to °C only for display
+    print("EE  value :", ee_val, f"({ee_val * SST_SCALE:.2f} °C)")
+    print("TIFF value:", tif_val, f"({tif_val * SST_SCALE:.2f} °C)")
+    if math.isnan(ee_val) or math.isnan(tif_val):
         print("⚠️  One of the values is NaN (nodata).")
     else:
         diff = tif_val - ee_val
-        print("Difference (TIFF − EE):", diff)
+        print("Difference (TIFF − EE):", diff, f"({diff * SST_SCALE:.2f} °C)")
 
 
 if __name__ == "__main__":
@@ -5,7 +5,7 @@ pixel scale.
 
 Usage
 -----
-    python export_hycom_temp0.py SCALE
+    python export_hycom_temp0.py SCALE [--no-hv] [--local | --wait]
 
 Arguments
 ~~~~~~~~~
@@ -14,7 +14,15 @@ SCALE  Pixel size in metres (e.g. 10000, 500000). The script queues an Earth
 
            hycom_temp0_20200315_s{SCALE/1000}k.tif
 
-       in your Drive folder ``EE_exports``.
+       in your Drive folder ``EE_exports``, as a Cloud-Optimized GeoTIFF
+       (tiled, with internal overviews).
+--no-hv
+       Use the standard Earth Engine endpoint instead of the high-volume one.
+--local
+       Skip Drive: download the image now as concurrent ``getDownloadURL``
+       tiles and mosaic them into ``hycom_temp0_20200315_s{SCALE/1000}k.vrt``.
+--wait
+       Poll the Drive export and print its state until it completes or fails.
 
 Prerequisites
 ~~~~~~~~~~~~~
@@ -24,57 +32,25 @@ Prerequisites
 
 from __future__ import annotations
 
-import sys
-import ee
+from _ee_export import export_image, parse_export_args
+from _ee_session import build_hycom_image, get_ee
 
-def main(scale_m: int) -> None:
-    ee.Initialize()
 
-    # ─── image for 15 Mar 2020 ───────────────────────────────────────────
-    d0 = ee.Date.fromYMD(2020, 3, 15)
-    img = (
-        ee.ImageCollection("HYCOM/sea_temp_salinity")
-        .filterDate(d0, d0.advance(1, "day"))
-        .first()
-        .select("water_temp_0")
-    )
+def main(scale_m: int, hv: bool = True, local: bool = False,
+         wait: bool = False) -> None:
+    """Queue an Earth Engine export at *scale_m* metres/pixel.
 
-    # ─── bounded global rectangle ───────────────────────────────────────
-    bbox = ee.Geometry.Rectangle([-180, -90, 180, 90], "EPSG:4326", False)
-    img = img.clip(bbox)
+    With *local*, download the image tile by tile instead of exporting it.
+    """
+    get_ee(hv=hv)
 
-    # ─── export task ────────────────────────────────────────────────────
-    tag = f"s{scale_m // 1000}k"
-    name = f"hycom_temp0_20200315_{tag}"
+    # ─── image for 15 Mar 2020 ─────────────────────────────────────────────
+    img = build_hycom_image((2020, 3, 15))
 
-    task = ee.batch.Export.image.toDrive(
-        image=img,
-        description=name,
-        folder="EE_exports",
-        fileNamePrefix=name,
-        region=bbox,
-        scale=scale_m,
-        crs="EPSG:4326",
-        maxPixels=1_000_000_000,
-    )
-    task.start()
-
-    print(
-        f"✓ Started Drive export '{name}'.\n"
-        f"  ‣ scale   : {scale_m} m/pixel\n"
-        f"  ‣ task id : {task.id}\n"
-        "Check the Earth Engine Tasks panel until the job is COMPLETED."
-    )
+    tag = f"s{scale_m // 1000}k"  # e.g. s10k, s250k, s1000k
+    export_image(img, f"hycom_temp0_20200315_{tag}", scale_m, local=local, wait=wait)
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        sys.exit("Usage: python export_hycom_temp0.py SCALE (metres)")
-    try:
-        scale = int(sys.argv[1])
-        if scale <= 0:
-            raise ValueError
-    except ValueError:
-        sys.exit("SCALE must be a positive integer (metres per pixel).")
-
-    main(scale)
+    args = parse_export_args("Export HYCOM surface temperature to Google Drive.")
+    main(args.scale, hv=args.hv, local=args.local, wait=args.wait)
@@ -3,14 +3,20 @@
 
 Usage
 -----
-    python export_oisst.py SCALE
+    python export_oisst.py SCALE [--no-hv] [--local | --wait]
 
 where *SCALE* is the desired pixel size **in metres** (e.g. 10000, 250000).
-The script queues a Drive export named
+Requests go to the high-volume Earth Engine endpoint unless ``--no-hv`` is
+given. The script queues a Drive export named
 
     oisst_20200315_s{SCALE/1000}k.tif
 
-in the folder `EE_exports` (created if absent).
+in the folder `EE_exports` (created if absent), as a Cloud-Optimized GeoTIFF
+(tiled, with internal overviews). With ``--local`` the image is
+instead downloaded right away as concurrent tiles and mosaicked into
+``oisst_20200315_s{SCALE/1000}k.vrt`` (needs ``requests`` and GDAL's
+``gdalbuildvrt``). ``--wait`` keeps polling the Drive export and prints its
+state until it completes or fails.
 
 Dependences: Google Earth Engine Python API (``pip install earthengine-api``).
 Ensure you have authenticated EE and enabled Drive access.
@@ -18,65 +24,25 @@ Ensure you have authenticated EE and enabled Drive access.
 
 from __future__ import annotations
 
-import sys
-from datetime import date
+from _ee_export import export_image, parse_export_args
+from _ee_session import build_oisst_image, get_ee
 
-import ee
 
-def main(scale_m: int) -> None:
-    """Queue an Earth Engine export at *scale_m* metres/pixel."""
-    ee.Initialize()
+def main(scale_m: int, hv: bool = True, local: bool = False,
+         wait: bool = False) -> None:
+    """Queue an Earth Engine export at *scale_m* metres/pixel.
 
-    # ─── date & image (hard-coded: 15 Mar 2020) ──────────────────────────
-    d0 = ee.Date.fromYMD(2020, 3, 15)
-    img = (
-        ee.ImageCollection("NOAA/CDR/OISST/V2_1")
-        .filterDate(d0, d0.advance(1, "day"))
-        .first()
-        .select("sst")
-    )
+    With *local*, download the image tile by tile instead of exporting it.
+    """
+    get_ee(hv=hv)
 
-    # ─── explicit, bounded region (-180…180, -90…90) ────────────────────
-    bbox = ee.Geometry.Rectangle(
-        coords=[-180, -90, 180, 90],
-        proj="EPSG:4326",
-        geodesic=False,
-    )
-    img = img.clip(bbox)
+    # ─── date & image (hard-coded: 15 Mar 2020) ────────────────────────────
+    img = build_oisst_image((2020, 3, 15))
 
-    # ─── prepare export ─────────────────────────────────────────────────
     tag = f"s{scale_m // 1000}k"  # e.g. s10k, s250k, s1000k
-    name = f"oisst_20200315_{tag}"
-
-    task = ee.batch.Export.image.toDrive(
-        image=img,
-        description=name,
-        folder="EE_exports",
-        fileNamePrefix=name,
-        region=bbox,
-        scale=scale_m,
-        crs="EPSG:4326",
-        maxPixels=1_000_000_000,
-    )
-    task.start()
-
-    print(
-        f"✓ Started Drive export '{name}'.\n"
-        f"  ‣ scale   : {scale_m} m/pixel\n"
-        f"  ‣ task id : {task.id}\n"
-        f"Check the Earth Engine Tasks panel and wait for COMPLETED."
-    )
+    export_image(img, f"oisst_20200315_{tag}", scale_m, local=local, wait=wait)
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        sys.exit("Usage: python export_oisst.py SCALE_in_metres (e.g. 10000)")
-
-    try:
-        scale = int(sys.argv[1])
-        if scale <= 0:
-            raise ValueError
-    except ValueError:
-        sys.exit("SCALE must be a positive integer (metres per pixel).")
-
-    main(scale)
+    args = parse_export_args("Export daily OISST SST to Google Drive.")
+    main(args.scale, hv=args.hv, local=args.local, wait=args.wait)
@@ -0,0 +1,145 @@
+"""Regression tests for the statistics in ``check_tif.py``."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+rasterio = pytest.importorskip("rasterio")
+
+import check_tif
+
+
+def _write_tif(path, data, nodata=None):
+    with rasterio.open(path, "w", driver="GTiff", width=data.shape[1],
+                       height=data.shape[0], count=1, dtype=data.dtype,
+                       crs="EPSG:4326",
+                       transform=rasterio.transform.from_origin(0, 90, 0.1, 0.1),
+                       tiled=True, blockxsize=256, blockysize=256,
+                       nodata=nodata) as ds:
+        ds.write(data, 1)
+    return path
+
+
+@pytest.fixture(params=["numba", "numpy"])
+def kernels(request, monkeypatch):
+    """Run each test through the Numba kernel and the NumPy fallback."""
+    if request.param == "numba":
+        if check_tif._kernels() is None:
+            pytest.skip("numba not installed")
+    else:
+        monkeypatch.setattr(check_tif, "_kernels", lambda: None)
+    return request.param
+
+
+@pytest.mark.parametrize("dtype", ["int32", "uint32", "int64"])
+def test_wide_int_stats_match_numpy(tmp_path, kernels, dtype):
+    data = np.full((1024, 1024), 1_000_000_000, dtype=dtype)
+    data[::2] = 2_000_000_000
+    path = _write_tif(tmp_path / "wide.tif", data)
+
+    with rasterio.open(path) as ds:
+        stats = check_tif.band_stats(ds)
+
+    assert stats["min"] == data.min()
+    assert stats["max"] == data.max()
+    assert stats["mean"] == pytest.approx(data.mean())
+    assert stats["std"] == pytest.approx(np.std(data.astype(np.float64)))
+
+
+def test_float_nan_rows_are_skipped(tmp_path, kernels):
+    rng = np.random.default_rng(0)
+    data = rng.normal(10, 3, (1024, 1024)).astype(np.float32)
+    data[100:400] = np.nan
+    data[-1] = np.nan
+    path = _write_tif(tmp_path / "nan.tif", data)
+
+    with rasterio.open(path) as ds:
+        stats = check_tif.band_stats(ds)
+
+    assert stats["min"] == pytest.approx(np.nanmin(data))
+    assert stats["max"] == pytest.approx(np.nanmax(data))
+    assert stats["mean"] == pytest.approx(np.nanmean(data, dtype=np.float64))
+    assert stats["std"] == pytest.approx(np.nanstd(data.astype(np.float64)))
+
+
+@pytest.mark.parametrize("sf", [4, 7])
+def test_block_average_matches_gdal_average(tmp_path, kernels, sf):
+    from rasterio.enums import Resampling
+
+    rng = np.random.default_rng(1)
+    data = rng.normal(10, 3, (sf * 100, sf * 150)).astype(np.float32)
+    data[:sf, :sf] = -999          # one all-nodata cell
+    data[sf:sf * 50, 3] = -999     # partly-nodata cells
+    path = _write_tif(tmp_path / "avg.tif", data, nodata=-999)
+
+    with rasterio.open(path) as ds:
+        out = check_tif.block_average(ds, sf)
+        ref = ds.read(1, out_shape=(1, 100, 150), resampling=Resampling.average,
+                      masked=True)
+
+    assert out.shape == (100, 150)
+    assert np.isnan(out[0, 0])
+    np.testing.assert_allclose(out[~ref.mask], ref.compressed(), rtol=1e-5)
+
+
+def test_block_average_ragged_edges(tmp_path, kernels):
+    sf = 5
+    data = np.arange(1001 * 1003, dtype=np.float32).reshape(1001, 1003)
+    path = _write_tif(tmp_path / "edge.tif", data)
+
+    with rasterio.open(path) as ds:
+        out = check_tif.block_average(ds, sf)
+
+    ref = data[:1000, :1000].reshape(200, sf, 200, sf).mean(axis=(1, 3))
+    np.testing.assert_allclose(out, ref, rtol=1e-6)
+
+
+def test_window_side():
+    assert check_tif._window_side(256, 4) == 256
+    assert check_tif._window_side(256, 3) == 768     # three blocks
+    assert check_tif._window_side(256, 5) == 255     # lcm would be 1280
+    assert check_tif._window_side(512, 33) == 33 * 15   # lcm would be 16896
+    assert check_tif._window_side(256, 300) == 300
+
+
+@pytest.mark.parametrize("scale, shape", [
+    (1.0, (1800, 3600)),   # full resolution, not the 2x overview
+    (0.5, (900, 1800)),    # 2x overview
+    (0.2, (360, 720)),     # 5x: no overview close enough, averaged read
+    (0.125, (225, 450)),   # 8x overview
+])
+def test_read_thumbnail_overview_choice(tmp_path, kernels, scale, shape):
+    from rasterio.enums import Resampling
+
+    data = np.arange(1800 * 3600, dtype=np.int32).reshape(1800, 3600) % 3000
+    path = _write_tif(tmp_path / "ovr.tif", data.astype(np.int16))
+    with rasterio.open(path, "r+") as ds:
+        ds.build_overviews([2, 4, 8, 16], Resampling.average)
+
+    with rasterio.open(path) as ds:
+        assert check_tif.read_thumbnail(ds, scale).shape == shape
+
+
+def test_zarr_cache_keys_on_source_path(tmp_path):
+    pytest.importorskip("zarr")
+    import os
+
+    a = _write_tif(tmp_path / "nod.tif", np.ones((4, 6), dtype=np.int16))
+    (tmp_path / "other").mkdir()
+    b = _write_tif(tmp_path / "other" / "nod.tif", np.zeros((2, 3), dtype=np.int16))
+    st = a.stat()
+    os.utime(b, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    def key(path):
+        st = path.stat()
+        return {"source": str(path), "source_size": st.st_size,
+                "source_mtime_ns": st.st_mtime_ns, "thumb_scale": 0.2,
+                "fast_stats": False}
+
+    cache = tmp_path / "cache"
+    thumb = np.ones((2, 3), dtype=np.float32)
+    check_tif.save_zarr_cache(cache, a, key(a), {"width": "6"}, {"min": 1.0}, thumb)
+
+    assert check_tif.load_zarr_cache(cache, b, key(b)) is None
+    metadata, stats, cached = check_tif.load_zarr_cache(cache, a, key(a))
+    assert metadata == {"width": "6"}
+    np.testing.assert_array_equal(cached, thumb)
@@ -0,0 +1,67 @@
+"""Tests for the batched lookups in ``compare_sst.py``."""
+
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+rasterio = pytest.importorskip("rasterio")
+
+import compare_sst
+
+
+@pytest.fixture
+def sst_tif(tmp_path):
+    """A 1°-grid global int32 raster whose value encodes its row and column."""
+    rows, cols = np.mgrid[0:180, 0:360]
+    data = (rows * 1000 + cols).astype(np.int32)
+    data[0, 0] = -999
+    path = tmp_path / "sst.tif"
+    with rasterio.open(path, "w", driver="GTiff", width=360, height=180, count=1,
+                       dtype="int32", crs="EPSG:4326", nodata=-999, tiled=True,
+                       transform=rasterio.transform.from_origin(-180, 90, 1, 1)) as ds:
+        ds.write(data, 1)
+    return path
+
+
+POINTS = [(-179.5, 89.5), (0.5, 0.5), (179.5, -89.5), (200.0, 0.0), (0.0, 95.0)]
+EXPECTED = [np.nan, 89 * 1000 + 180, 179 * 1000 + 359, np.nan, np.nan]
+
+
+@pytest.mark.parametrize("limit", [1 << 20, 0])  # window read, then ds.sample
+def test_tiff_sst_values(sst_tif, monkeypatch, limit):
+    monkeypatch.setattr(compare_sst, "WINDOW_READ_LIMIT", limit)
+    np.testing.assert_array_equal(compare_sst.tiff_sst_values(sst_tif, POINTS),
+                                  EXPECTED)
+
+
+def test_query_ee_dedups_and_batches(monkeypatch):
+    sent = []
+
+    class Result:
+        def __init__(self, fc):
+            self.fc = fc
+
+        def getInfo(self):
+            return {"features": [{"properties": {"first": lon * 10 + lat}}
+                                 for lon, lat in self.fc]}
+
+    class Image:
+        def reduceRegions(self, collection, reducer, scale):
+            sent.append(len(collection))
+            return Result(collection)
+
+    ee = SimpleNamespace(
+        FeatureCollection=list,
+        Feature=lambda geom: geom,
+        Geometry=SimpleNamespace(Point=lambda x, y: (x, y)),
+        Reducer=SimpleNamespace(first=lambda: None),
+    )
+    monkeypatch.setattr(compare_sst, "get_ee", lambda hv=False: ee)
+    monkeypatch.setattr(compare_sst, "build_oisst_image", lambda date: Image())
+    monkeypatch.setattr(compare_sst, "EE_BATCH_LIMIT", 2)
+
+    vals = compare_sst._query_ee([(1, 2), (3, 4), (1, 2), (5, 6), (7, 8)], 1000)
+
+    assert vals == [12, 34, 12, 56, 78]
+    assert sent == [2, 2]
@@ -0,0 +1,25 @@
+"""Tests for the ``--local`` tile grid in ``_ee_export.py``."""
+
+import math
+
+import pytest
+
+import _ee_export
+
+
+@pytest.mark.parametrize("scale_m", [5000, 10000, 250000])
+def test_tile_grid_shares_one_pixel_grid(scale_m):
+    bounds = (-180, -90, 180, 90)
+    tiles = _ee_export.tile_grid(bounds, scale_m)
+    px = scale_m / _ee_export.METRES_PER_DEGREE
+    width = math.ceil(360 / px)
+    height = math.ceil(180 / px)
+
+    covered = 0
+    for transform, (w, h) in tiles:
+        assert transform[0] == px and transform[4] == -px
+        assert (transform[2] + 180) / px == pytest.approx(round((transform[2] + 180) / px))
+        assert (90 - transform[5]) / px == pytest.approx(round((90 - transform[5]) / px))
+        assert w * h * _ee_export.BYTES_PER_PIXEL <= _ee_export.DOWNLOAD_LIMIT_BYTES
+        covered += w * h
+    assert covered == width * height